@@ -3,6 +3,12 @@ Procure-Pro-ISO API Module
 Contains all API routes, models, schemas, and utilities
 """
 
-from api.routes import api_bp
+from api._lazy import lazy_exports
 
+# The blueprint pulls in Flask, SQLAlchemy and every route handler, so it is
+# only imported on first access; importing api.utils alone stays lightweight
 __all__ = ['api_bp']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'api_bp': 'api.routes',
+})
@@ -0,0 +1,37 @@
+"""
+Lazy Package Exports
+Helpers for packages whose public names are imported on first access
+"""
+
+import importlib
+import sys
+
+
+def lazy_exports(package_name, imports):
+    """
+    Build PEP 562 module hooks that import exports on first access.
+
+    Args:
+        package_name: __name__ of the package defining the hooks
+        imports: Mapping of exported name to the module that defines it
+
+    Returns:
+        Tuple of (__getattr__, __dir__) for the package to bind
+    """
+    package = sys.modules[package_name]
+
+    def __getattr__(name):
+        module_name = imports.get(name)
+        if module_name is None:
+            raise AttributeError(
+                f"module {package_name!r} has no attribute {name!r}"
+            )
+        value = getattr(importlib.import_module(module_name), name)
+        # Cache on the package so later lookups skip this hook
+        setattr(package, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(package)) | set(imports))
+
+    return __getattr__, __dir__
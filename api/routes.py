@@ -3,14 +3,21 @@ API Routes Module
 Defines all REST API endpoints for the procurement system
 """
 
+import threading
+import time
+from collections import OrderedDict
 from flask import Blueprint, jsonify, request, current_app
 from functools import wraps
 from database.connection import get_db
 from sqlalchemy import text
+from api.utils.tbe_calculator import QuotationScore, TBECalculator
 
 # Create API blueprint
 api_bp = Blueprint('api', __name__)
 
+# Stateless between calls, so one instance serves every request
+tbe_calculator = TBECalculator()
+
 
 # ============================================
 # DECORATORS
@@ -51,78 +58,187 @@ def paginate(default_limit=20, max_limit=100):
     return decorator
 
 
+def cache_response(ttl=60, maxsize=128):
+    """
+    Decorator to cache successful responses per path and query string.
+
+    Entries expire after `ttl` seconds and the least recently used entry
+    is evicted once `maxsize` is reached. Only the response body and its
+    ETag are kept, so each hit still gets a fresh response object, and
+    clients revalidating with If-None-Match get a 304 without a body.
+
+    The cache is per process; write handlers call the wrapper's
+    `cache_clear()` so the worker that handled the write serves fresh
+    data, while other workers may lag by up to `ttl` seconds.
+    """
+    def decorator(f):
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            now = time.monotonic()
+
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(key)
+                    response = current_app.response_class(
+                        entry[1], status=200, mimetype='application/json'
+                    )
+                    response.set_etag(entry[2])
+                    return response.make_conditional(request)
+
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.add_etag()
+                with lock:
+                    cache[key] = (
+                        now + ttl, response.get_data(), response.get_etag()[0]
+                    )
+                    cache.move_to_end(key)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+                return response.make_conditional(request)
+            return response
+
+        decorated_function.cache_clear = cache_clear
+        return decorated_function
+    return decorator
+
+
+def conditional_response(f):
+    """
+    Decorator to add an ETag to successful responses and answer matching
+    If-None-Match requests with a 304.
+
+    Nothing is cached server-side, so the query still runs and clients
+    always see committed data; only the unchanged body is not resent.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = current_app.make_response(f(*args, **kwargs))
+        if response.status_code == 200:
+            response.add_etag()
+            return response.make_conditional(request)
+        return response
+    return decorated_function
+
+
+def invalidate_reports():
+    """Drop cached report responses after a write changes their figures."""
+    dashboard_report.cache_clear()
+    procurement_summary.cache_clear()
+
+
+def fetch_page(db, query, params, count_query):
+    """
+    Run a paginated query whose last column is COUNT(*) OVER().
+
+    The total comes back with the page itself, so a separate COUNT
+    round-trip is only needed when the requested page is past the end.
+
+    Returns:
+        Tuple of (rows, total)
+    """
+    rows = db.execute(text(query), params).fetchall()
+    if rows:
+        return rows, rows[0][-1]
+    if params.get('offset'):
+        return rows, db.execute(text(count_query), params).scalar()
+    return rows, 0
+
+
 # ============================================
 # DOCUMENTATION ENDPOINT
 # ============================================
 
+# Static payload, built once at import and serialized on first request
+API_DOCS = {
+    'api_version': 'v1',
+    'base_url': '/api/v1',
+    'endpoints': {
+        'projects': {
+            'list': 'GET /projects',
+            'create': 'POST /projects',
+            'get': 'GET /projects/<id>',
+            'update': 'PUT /projects/<id>',
+            'delete': 'DELETE /projects/<id>'
+        },
+        'vendors': {
+            'list': 'GET /vendors',
+            'create': 'POST /vendors',
+            'get': 'GET /vendors/<id>',
+            'update': 'PUT /vendors/<id>',
+            'delete': 'DELETE /vendors/<id>',
+            'approve': 'POST /vendors/<id>/approve'
+        },
+        'items': {
+            'list': 'GET /items',
+            'create': 'POST /items',
+            'get': 'GET /items/<id>',
+            'update': 'PUT /items/<id>',
+            'delete': 'DELETE /items/<id>'
+        },
+        'rfqs': {
+            'list': 'GET /rfqs',
+            'create': 'POST /rfqs',
+            'get': 'GET /rfqs/<id>',
+            'update': 'PUT /rfqs/<id>',
+            'delete': 'DELETE /rfqs/<id>',
+            'items': 'GET /rfqs/<id>/items',
+            'invite_vendors': 'POST /rfqs/<id>/invite',
+            'close': 'POST /rfqs/<id>/close'
+        },
+        'quotations': {
+            'list': 'GET /quotations',
+            'create': 'POST /quotations',
+            'get': 'GET /quotations/<id>',
+            'update': 'PUT /quotations/<id>',
+            'compare': 'GET /rfqs/<rfq_id>/quotations/compare'
+        },
+        'tbe_evaluations': {
+            'list': 'GET /tbe-evaluations',
+            'create': 'POST /tbe-evaluations',
+            'get': 'GET /tbe-evaluations/<id>',
+            'calculate': 'POST /tbe-evaluations/<id>/calculate',
+            'results': 'GET /tbe-evaluations/<id>/results',
+            'finalize': 'POST /tbe-evaluations/<id>/finalize'
+        },
+        'purchase_orders': {
+            'list': 'GET /purchase-orders',
+            'create': 'POST /purchase-orders',
+            'get': 'GET /purchase-orders/<id>',
+            'update': 'PUT /purchase-orders/<id>',
+            'approve': 'POST /purchase-orders/<id>/approve',
+            'cancel': 'POST /purchase-orders/<id>/cancel'
+        },
+        'reports': {
+            'dashboard': 'GET /reports/dashboard',
+            'procurement_summary': 'GET /reports/procurement-summary',
+            'vendor_performance': 'GET /reports/vendor-performance'
+        }
+    }
+}
+_api_docs_body = None
+
+
 @api_bp.route('/docs')
 def api_docs():
     """API Documentation endpoint."""
-    return jsonify({
-        'api_version': 'v1',
-        'base_url': '/api/v1',
-        'endpoints': {
-            'projects': {
-                'list': 'GET /projects',
-                'create': 'POST /projects',
-                'get': 'GET /projects/<id>',
-                'update': 'PUT /projects/<id>',
-                'delete': 'DELETE /projects/<id>'
-            },
-            'vendors': {
-                'list': 'GET /vendors',
-                'create': 'POST /vendors',
-                'get': 'GET /vendors/<id>',
-                'update': 'PUT /vendors/<id>',
-                'delete': 'DELETE /vendors/<id>',
-                'approve': 'POST /vendors/<id>/approve'
-            },
-            'items': {
-                'list': 'GET /items',
-                'create': 'POST /items',
-                'get': 'GET /items/<id>',
-                'update': 'PUT /items/<id>',
-                'delete': 'DELETE /items/<id>'
-            },
-            'rfqs': {
-                'list': 'GET /rfqs',
-                'create': 'POST /rfqs',
-                'get': 'GET /rfqs/<id>',
-                'update': 'PUT /rfqs/<id>',
-                'delete': 'DELETE /rfqs/<id>',
-                'items': 'GET /rfqs/<id>/items',
-                'invite_vendors': 'POST /rfqs/<id>/invite',
-                'close': 'POST /rfqs/<id>/close'
-            },
-            'quotations': {
-                'list': 'GET /quotations',
-                'create': 'POST /quotations',
-                'get': 'GET /quotations/<id>',
-                'update': 'PUT /quotations/<id>',
-                'compare': 'GET /rfqs/<rfq_id>/quotations/compare'
-            },
-            'tbe_evaluations': {
-                'list': 'GET /tbe-evaluations',
-                'create': 'POST /tbe-evaluations',
-                'get': 'GET /tbe-evaluations/<id>',
-                'calculate': 'POST /tbe-evaluations/<id>/calculate',
-                'finalize': 'POST /tbe-evaluations/<id>/finalize'
-            },
-            'purchase_orders': {
-                'list': 'GET /purchase-orders',
-                'create': 'POST /purchase-orders',
-                'get': 'GET /purchase-orders/<id>',
-                'update': 'PUT /purchase-orders/<id>',
-                'approve': 'POST /purchase-orders/<id>/approve',
-                'cancel': 'POST /purchase-orders/<id>/cancel'
-            },
-            'reports': {
-                'dashboard': 'GET /reports/dashboard',
-                'procurement_summary': 'GET /reports/procurement-summary',
-                'vendor_performance': 'GET /reports/vendor-performance'
-            }
-        }
-    }), 200
+    global _api_docs_body
+    if _api_docs_body is None:
+        _api_docs_body = current_app.json.dumps(API_DOCS)
+    response = current_app.response_class(
+        _api_docs_body, status=200, mimetype='application/json'
+    )
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 # ============================================
@@ -136,18 +252,15 @@ def list_projects(page, limit, offset):
     """List all projects with pagination."""
     db = get_db()
 
-    # Get total count
-    count_result = db.execute(text("SELECT COUNT(*) FROM projects"))
-    total = count_result.scalar()
-
-    # Get paginated results
-    result = db.execute(text("""
+    # Get paginated results together with the total count
+    result, total = fetch_page(db, """
         SELECT id, project_number, name, client_name, status,
-               start_date, end_date, budget, currency, created_at
+               start_date, end_date, budget, currency, created_at,
+               COUNT(*) OVER() as total_count
         FROM projects
         ORDER BY created_at DESC
         LIMIT :limit OFFSET :offset
-    """), {'limit': limit, 'offset': offset})
+    """, {'limit': limit, 'offset': offset}, "SELECT COUNT(*) FROM projects")
 
     projects = []
     for row in result:
@@ -191,19 +304,15 @@ def create_project():
 
     db = get_db()
 
-    # Generate project number
-    result = db.execute(text("SELECT generate_sequence_number('project')"))
-    project_number = result.scalar()
-
-    # Insert project
+    # Insert project (number is generated in the same round-trip)
     result = db.execute(text("""
         INSERT INTO projects (project_number, name, description, client_name,
                              status, start_date, end_date, budget, currency)
-        VALUES (:project_number, :name, :description, :client_name,
-                :status, :start_date, :end_date, :budget, :currency)
+        VALUES (generate_sequence_number('project'), :name, :description,
+                :client_name, :status, :start_date, :end_date, :budget,
+                :currency)
         RETURNING id, project_number, created_at
     """), {
-        'project_number': project_number,
         'name': data['name'],
         'description': data.get('description'),
         'client_name': data.get('client_name'),
@@ -216,6 +325,7 @@ def create_project():
 
     row = result.fetchone()
     db.commit()
+    invalidate_reports()
 
     return jsonify({
         'message': 'Project created successfully',
@@ -297,22 +407,16 @@ def list_vendors(page, limit, offset):
 
     where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
-    # Get total count
-    count_result = db.execute(
-        text(f"SELECT COUNT(*) FROM vendors {where_clause}"),
-        params
-    )
-    total = count_result.scalar()
-
-    # Get paginated results
-    result = db.execute(text(f"""
+    # Get paginated results together with the total count
+    result, total = fetch_page(db, f"""
         SELECT id, vendor_code, company_name, contact_person, email,
-               phone, city, country, is_approved, rating, created_at
+               phone, city, country, is_approved, rating, created_at,
+               COUNT(*) OVER() as total_count
         FROM vendors
         {where_clause}
         ORDER BY company_name
         LIMIT :limit OFFSET :offset
-    """), params)
+    """, params, f"SELECT COUNT(*) FROM vendors {where_clause}")
 
     vendors = []
     for row in result:
@@ -357,21 +461,17 @@ def create_vendor():
 
     db = get_db()
 
-    # Generate vendor code
-    result = db.execute(text("SELECT generate_sequence_number('vendor')"))
-    vendor_code = result.scalar()
-
-    # Insert vendor
+    # Insert vendor (code is generated in the same round-trip)
     result = db.execute(text("""
         INSERT INTO vendors (vendor_code, company_name, trade_name, contact_person,
                             email, phone, address, city, country, website,
                             tax_id, payment_terms, vendor_type, notes)
-        VALUES (:vendor_code, :company_name, :trade_name, :contact_person,
-                :email, :phone, :address, :city, :country, :website,
+        VALUES (generate_sequence_number('vendor'), :company_name,
+                :trade_name, :contact_person, :email, :phone, :address,
+                :city, :country, :website,
                 :tax_id, :payment_terms, :vendor_type, :notes)
         RETURNING id, vendor_code, created_at
     """), {
-        'vendor_code': vendor_code,
         'company_name': data['company_name'],
         'trade_name': data.get('trade_name'),
         'contact_person': data.get('contact_person'),
@@ -389,6 +489,7 @@ def create_vendor():
 
     row = result.fetchone()
     db.commit()
+    invalidate_reports()
 
     return jsonify({
         'message': 'Vendor created successfully',
@@ -427,27 +528,21 @@ def list_rfqs(page, limit, offset):
 
     where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
-    # Get total count
-    count_result = db.execute(
-        text(f"SELECT COUNT(*) FROM rfqs r {where_clause}"),
-        params
-    )
-    total = count_result.scalar()
-
-    # Get paginated results with summary
-    result = db.execute(text(f"""
+    # Get paginated results with summary and total count
+    result, total = fetch_page(db, f"""
         SELECT r.id, r.rfq_number, r.title, r.status, r.issue_date,
                r.closing_date, r.currency, r.estimated_value,
                p.project_number, p.name as project_name,
                (SELECT COUNT(*) FROM rfq_items ri WHERE ri.rfq_id = r.id) as item_count,
                (SELECT COUNT(*) FROM quotations q WHERE q.rfq_id = r.id) as quotation_count,
-               r.created_at
+               r.created_at,
+               COUNT(*) OVER() as total_count
         FROM rfqs r
         LEFT JOIN projects p ON r.project_id = p.id
         {where_clause}
         ORDER BY r.created_at DESC
         LIMIT :limit OFFSET :offset
-    """), params)
+    """, params, f"SELECT COUNT(*) FROM rfqs r {where_clause}")
 
     rfqs = []
     for row in result:
@@ -494,23 +589,18 @@ def create_rfq():
 
     db = get_db()
 
-    # Generate RFQ number
-    result = db.execute(text("SELECT generate_sequence_number('rfq')"))
-    rfq_number = result.scalar()
-
-    # Insert RFQ
+    # Insert RFQ (number is generated in the same round-trip)
     result = db.execute(text("""
         INSERT INTO rfqs (rfq_number, title, description, project_id,
                          status, rfq_type, priority, issue_date, closing_date,
                          validity_days, delivery_location, currency, estimated_value,
                          terms_and_conditions, special_instructions)
-        VALUES (:rfq_number, :title, :description, :project_id,
-                :status, :rfq_type, :priority, :issue_date, :closing_date,
-                :validity_days, :delivery_location, :currency, :estimated_value,
-                :terms_and_conditions, :special_instructions)
+        VALUES (generate_sequence_number('rfq'), :title, :description,
+                :project_id, :status, :rfq_type, :priority, :issue_date,
+                :closing_date, :validity_days, :delivery_location, :currency,
+                :estimated_value, :terms_and_conditions, :special_instructions)
         RETURNING id, rfq_number, created_at
     """), {
-        'rfq_number': rfq_number,
         'title': data['title'],
         'description': data.get('description'),
         'project_id': data.get('project_id'),
@@ -529,6 +619,7 @@ def create_rfq():
 
     row = result.fetchone()
     db.commit()
+    invalidate_reports()
 
     return jsonify({
         'message': 'RFQ created successfully',
@@ -625,25 +716,19 @@ def list_purchase_orders(page, limit, offset):
 
     where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
-    # Get total count
-    count_result = db.execute(
-        text(f"SELECT COUNT(*) FROM purchase_orders po {where_clause}"),
-        params
-    )
-    total = count_result.scalar()
-
-    # Get results
-    result = db.execute(text(f"""
+    # Get results together with the total count
+    result, total = fetch_page(db, f"""
         SELECT po.id, po.po_number, po.status, po.po_date, po.delivery_date,
                po.total_amount, po.currency, v.company_name as vendor_name,
-               p.project_number, po.created_at
+               p.project_number, po.created_at,
+               COUNT(*) OVER() as total_count
         FROM purchase_orders po
         LEFT JOIN vendors v ON po.vendor_id = v.id
         LEFT JOIN projects p ON po.project_id = p.id
         {where_clause}
         ORDER BY po.created_at DESC
         LIMIT :limit OFFSET :offset
-    """), params)
+    """, params, f"SELECT COUNT(*) FROM purchase_orders po {where_clause}")
 
     purchase_orders = []
     for row in result:
@@ -725,23 +810,82 @@ def list_tbe_evaluations(page, limit, offset):
 @handle_errors
 def calculate_tbe(evaluation_id):
     """Calculate TBE scores for all quotations."""
-    from api.utils.tbe_calculator import TBECalculator
-
-    calculator = TBECalculator()
-    result = calculator.calculate_scores(evaluation_id)
+    result = tbe_calculator.calculate_scores(evaluation_id)
 
     return jsonify({
         'message': 'TBE calculation completed',
-        'data': result
+        'data': result.to_dict()
     }), 200
 
 
+@api_bp.route('/tbe-evaluations/<evaluation_id>/results', methods=['GET'])
+@handle_errors
+def get_tbe_results(evaluation_id):
+    """Get the last calculated TBE scores without recalculating."""
+    db = get_db()
+
+    # Join from the evaluation so an unknown id is a 404 while an
+    # evaluation that has not been calculated yet has no scores
+    result = db.execute(text("""
+        SELECT s.quotation_id, s.vendor_id, v.company_name,
+               s.price_score, s.quality_score, s.delivery_score,
+               s.compliance_score, s.total_weighted_score, s.rank,
+               s.is_recommended, s.remarks
+        FROM tbe_evaluations e
+        LEFT JOIN tbe_summary s ON s.tbe_id = e.id
+        LEFT JOIN vendors v ON s.vendor_id = v.id
+        WHERE e.id = :eval_id
+        ORDER BY s.rank
+    """), {'eval_id': evaluation_id})
+
+    rows = result.fetchall()
+
+    if not rows:
+        return jsonify({'error': 'TBE evaluation not found'}), 404
+
+    # Same representation as the calculate endpoint
+    scores = [
+        QuotationScore(
+            quotation_id=str(row[0]),
+            vendor_id=str(row[1]) if row[1] else None,
+            vendor_name=row[2],
+            price_score=row[3],
+            quality_score=row[4],
+            delivery_score=row[5],
+            compliance_score=row[6],
+            total_weighted_score=row[7],
+            rank=row[8],
+            is_recommended=row[9],
+            remarks=row[10]
+        ).to_dict()
+        for row in rows
+        if row[0] is not None
+    ]
+
+    response = jsonify({
+        'data': {
+            'evaluation_id': evaluation_id,
+            'scores': scores,
+            'recommended_vendor_id': next(
+                (s['vendor_id'] for s in scores if s['is_recommended']), None
+            )
+        }
+    })
+
+    # Results only change on recalculation; let clients revalidate cheaply
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
 # ============================================
 # REPORT ENDPOINTS
 # ============================================
 
 @api_bp.route('/reports/dashboard', methods=['GET'])
 @handle_errors
+@cache_response(ttl=60)
 def dashboard_report():
     """Get dashboard summary data."""
     db = get_db()
@@ -775,6 +919,7 @@ def dashboard_report():
 
 @api_bp.route('/reports/procurement-summary', methods=['GET'])
 @handle_errors
+@cache_response(ttl=60)
 def procurement_summary():
     """Get procurement summary report."""
     db = get_db()
@@ -818,6 +963,7 @@ def procurement_summary():
 
 @api_bp.route('/units-of-measure', methods=['GET'])
 @handle_errors
+@conditional_response
 def list_units():
     """List all units of measure."""
     db = get_db()
@@ -843,6 +989,7 @@ def list_units():
 
 @api_bp.route('/currencies', methods=['GET'])
 @handle_errors
+@conditional_response
 def list_currencies():
     """List all currencies."""
     db = get_db()
@@ -3,7 +3,13 @@ API Utilities Module
 Contains helper functions for RFQ parsing, TBE calculations, etc.
 """
 
-from api.utils.rfq_parser import RFQParser
-from api.utils.tbe_calculator import TBECalculator
+from api._lazy import lazy_exports
 
+# Submodules are imported on first attribute access so that loading one
+# utility (e.g. the TBE calculator from a route) does not pull in the others
 __all__ = ['RFQParser', 'TBECalculator']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'RFQParser': 'api.utils.rfq_parser',
+    'TBECalculator': 'api.utils.tbe_calculator',
+})
@@ -12,6 +12,59 @@ from datetime import datetime, date
 
 logger = logging.getLogger(__name__)
 
+# Cell values pandas produces for empty spreadsheet cells; one shared set
+# keeps the column checks in _parse_excel_row consistent
+_EMPTY_CELL_VALUES = frozenset({'nan', 'none', ''})
+
+# Header detail patterns, compiled once at import
+_RFQ_NUMBER_REGEXES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'RFQ\s*(?:No\.?|Number|#)?\s*:?\s*([A-Z0-9\-/]+)',
+    r'Request\s+for\s+Quotation\s*:?\s*([A-Z0-9\-/]+)',
+    r'Inquiry\s*(?:No\.?|#)?\s*:?\s*([A-Z0-9\-/]+)',
+))
+
+_PROJECT_REGEXES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Project\s*(?:Name|Title)?\s*:?\s*([^\n]+)',
+    r'Job\s*(?:Name|No\.?)?\s*:?\s*([^\n]+)',
+))
+
+_DELIVERY_REGEXES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Delivery\s+(?:Location|Address|Point)\s*:?\s*([^\n]+)',
+    r'Ship\s+to\s*:?\s*([^\n]+)',
+))
+
+_PAYMENT_REGEXES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Payment\s+Terms?\s*:?\s*([^\n]+)',
+    r'Terms\s+of\s+Payment\s*:?\s*([^\n]+)',
+))
+
+# Labels preceding each header date; combined with DATE_PATTERNS per class
+_DATE_LABELS = {
+    'issue_date': ('issue date', 'date issued', 'rfq date'),
+    'closing_date': (
+        'closing date', 'due date', 'submission deadline', 'valid until'
+    ),
+}
+
+
+def _compile_unit_regexes(unit_patterns):
+    """Compile a UNIT_PATTERNS table into (code, regex) pairs."""
+    return tuple(
+        (code, re.compile(pattern)) for code, pattern in unit_patterns.items()
+    )
+
+
+def _compile_date_label_regexes(date_patterns):
+    """Compile the header date-label regexes for a DATE_PATTERNS list."""
+    date_alternation = "|".join(date_patterns)
+    return {
+        attr: tuple(
+            re.compile(rf'{label}\s*:?\s*({date_alternation})', re.IGNORECASE)
+            for label in labels
+        )
+        for attr, labels in _DATE_LABELS.items()
+    }
+
 
 @dataclass
 class ParsedRFQItem:
@@ -76,6 +129,43 @@ class RFQParser:
         r'(\d{1,2}\s+\w+\s+\d{4})',
     ]
 
+    # Compiled forms of the two tables above
+    _unit_regexes = _compile_unit_regexes(UNIT_PATTERNS)
+    _date_label_regexes = _compile_date_label_regexes(DATE_PATTERNS)
+
+    # strptime formats tried in order when parsing dates
+    DATE_FORMATS = (
+        '%d/%m/%Y', '%m/%d/%Y', '%Y-%m-%d',
+        '%d-%m-%Y', '%m-%d-%Y',
+        '%d %B %Y', '%B %d, %Y',
+        '%d/%m/%y', '%m/%d/%y'
+    )
+
+    # Keywords that identify a spreadsheet header row
+    HEADER_KEYWORDS = (
+        'description', 'item', 'quantity', 'qty', 'unit', 'price'
+    )
+
+    # Header keywords used to map spreadsheet columns to item fields
+    COLUMN_KEYWORDS = {
+        'description': ('description', 'item', 'material', 'product', 'name'),
+        'quantity': ('quantity', 'qty', 'amount', 'count'),
+        'unit': ('unit', 'uom', 'u/m', 'measure'),
+        'price': ('price', 'rate', 'cost', 'target', 'estimate'),
+        'specifications': ('specifications', 'specs', 'spec', 'details'),
+        'delivery_date': ('delivery', 'required', 'date', 'due'),
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Recompile when a subclass overrides either pattern table
+        if 'UNIT_PATTERNS' in vars(cls):
+            cls._unit_regexes = _compile_unit_regexes(cls.UNIT_PATTERNS)
+        if 'DATE_PATTERNS' in vars(cls):
+            cls._date_label_regexes = _compile_date_label_regexes(
+                cls.DATE_PATTERNS
+            )
+
     def __init__(self):
         self.errors: List[str] = []
         self.warnings: List[str] = []
@@ -260,38 +350,24 @@ class RFQParser:
     def _extract_rfq_details(self, text: str, rfq: ParsedRFQ) -> None:
         """Extract RFQ header details from text content."""
 
-        # RFQ Number patterns
-        rfq_patterns = [
-            r'RFQ\s*(?:No\.?|Number|#)?\s*:?\s*([A-Z0-9\-/]+)',
-            r'Request\s+for\s+Quotation\s*:?\s*([A-Z0-9\-/]+)',
-            r'Inquiry\s*(?:No\.?|#)?\s*:?\s*([A-Z0-9\-/]+)',
-        ]
-        for pattern in rfq_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        # RFQ Number
+        for regex in _RFQ_NUMBER_REGEXES:
+            match = regex.search(text)
             if match:
                 rfq.rfq_number = match.group(1).strip()
                 break
 
         # Project name
-        project_patterns = [
-            r'Project\s*(?:Name|Title)?\s*:?\s*([^\n]+)',
-            r'Job\s*(?:Name|No\.?)?\s*:?\s*([^\n]+)',
-        ]
-        for pattern in project_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for regex in _PROJECT_REGEXES:
+            match = regex.search(text)
             if match:
                 rfq.project_name = match.group(1).strip()
                 break
 
         # Dates
-        date_labels = {
-            'issue_date': ['issue date', 'date issued', 'rfq date'],
-            'closing_date': ['closing date', 'due date', 'submission deadline', 'valid until']
-        }
-        for attr, labels in date_labels.items():
-            for label in labels:
-                pattern = rf'{label}\s*:?\s*({"|".join(self.DATE_PATTERNS)})'
-                match = re.search(pattern, text, re.IGNORECASE)
+        for attr, regexes in self._date_label_regexes.items():
+            for regex in regexes:
+                match = regex.search(text)
                 if match:
                     parsed_date = self._parse_date(match.group(1))
                     if parsed_date:
@@ -299,23 +375,15 @@ class RFQParser:
                     break
 
         # Delivery location
-        delivery_patterns = [
-            r'Delivery\s+(?:Location|Address|Point)\s*:?\s*([^\n]+)',
-            r'Ship\s+to\s*:?\s*([^\n]+)',
-        ]
-        for pattern in delivery_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for regex in _DELIVERY_REGEXES:
+            match = regex.search(text)
             if match:
                 rfq.delivery_location = match.group(1).strip()
                 break
 
         # Payment terms
-        payment_patterns = [
-            r'Payment\s+Terms?\s*:?\s*([^\n]+)',
-            r'Terms\s+of\s+Payment\s*:?\s*([^\n]+)',
-        ]
-        for pattern in payment_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for regex in _PAYMENT_REGEXES:
+            match = regex.search(text)
             if match:
                 rfq.payment_terms = match.group(1).strip()
                 break
@@ -330,11 +398,12 @@ class RFQParser:
 
     def _find_header_row(self, df) -> Optional[int]:
         """Find the row that contains column headers."""
-        header_keywords = ['description', 'item', 'quantity', 'qty', 'unit', 'price']
-
         for idx in range(min(10, len(df))):
             row_values = [str(v).lower() for v in df.iloc[idx].values if v]
-            matches = sum(1 for kw in header_keywords if any(kw in v for v in row_values))
+            matches = sum(
+                1 for kw in self.HEADER_KEYWORDS
+                if any(kw in v for v in row_values)
+            )
             if matches >= 2:
                 return idx
 
@@ -345,16 +414,7 @@ class RFQParser:
         mapping = {}
         columns_lower = [str(c).lower() for c in columns]
 
-        column_keywords = {
-            'description': ['description', 'item', 'material', 'product', 'name'],
-            'quantity': ['quantity', 'qty', 'amount', 'count'],
-            'unit': ['unit', 'uom', 'u/m', 'measure'],
-            'price': ['price', 'rate', 'cost', 'target', 'estimate'],
-            'specifications': ['specifications', 'specs', 'spec', 'details'],
-            'delivery_date': ['delivery', 'required', 'date', 'due'],
-        }
-
-        for field, keywords in column_keywords.items():
+        for field, keywords in self.COLUMN_KEYWORDS.items():
             for i, col in enumerate(columns_lower):
                 if any(kw in col for kw in keywords):
                     mapping[field] = i
@@ -372,7 +432,7 @@ class RFQParser:
                 return None
 
             description = str(row.iloc[desc_idx]) if desc_idx < len(row) else ""
-            if not description or description.lower() in ['nan', 'none', '']:
+            if not description or description.lower() in _EMPTY_CELL_VALUES:
                 return None
 
             # Get quantity
@@ -381,7 +441,8 @@ class RFQParser:
             if qty_idx is not None and qty_idx < len(row):
                 try:
                     qty_val = row.iloc[qty_idx]
-                    if qty_val and str(qty_val).lower() not in ['nan', 'none']:
+                    if (qty_val and str(qty_val).lower()
+                            not in _EMPTY_CELL_VALUES):
                         quantity = Decimal(str(qty_val).replace(',', ''))
                 except Exception:
                     pass
@@ -391,7 +452,8 @@ class RFQParser:
             unit_idx = column_mapping.get('unit')
             if unit_idx is not None and unit_idx < len(row):
                 unit_val = row.iloc[unit_idx]
-                if unit_val and str(unit_val).lower() not in ['nan', 'none']:
+                if (unit_val and str(unit_val).lower()
+                        not in _EMPTY_CELL_VALUES):
                     unit = str(unit_val).strip()
 
             # Get price
@@ -400,7 +462,8 @@ class RFQParser:
             if price_idx is not None and price_idx < len(row):
                 try:
                     price_val = row.iloc[price_idx]
-                    if price_val and str(price_val).lower() not in ['nan', 'none']:
+                    if (price_val and str(price_val).lower()
+                            not in _EMPTY_CELL_VALUES):
                         price_str = str(price_val).replace(',', '').replace('$', '')
                         target_price = Decimal(price_str)
                 except Exception:
@@ -411,7 +474,8 @@ class RFQParser:
             spec_idx = column_mapping.get('specifications')
             if spec_idx is not None and spec_idx < len(row):
                 spec_val = row.iloc[spec_idx]
-                if spec_val and str(spec_val).lower() not in ['nan', 'none']:
+                if (spec_val and str(spec_val).lower()
+                        not in _EMPTY_CELL_VALUES):
                     specs = str(spec_val).strip()
 
             return ParsedRFQItem(
@@ -429,16 +493,11 @@ class RFQParser:
 
     def _parse_date(self, date_str: str) -> Optional[date]:
         """Parse date string into date object."""
-        date_formats = [
-            '%d/%m/%Y', '%m/%d/%Y', '%Y-%m-%d',
-            '%d-%m-%Y', '%m-%d-%Y',
-            '%d %B %Y', '%B %d, %Y',
-            '%d/%m/%y', '%m/%d/%y'
-        ]
-
-        for fmt in date_formats:
+        date_str = date_str.strip()
+
+        for fmt in self.DATE_FORMATS:
             try:
-                return datetime.strptime(date_str.strip(), fmt).date()
+                return datetime.strptime(date_str, fmt).date()
             except ValueError:
                 continue
 
@@ -448,8 +507,8 @@ class RFQParser:
         """Normalize unit string to standard code."""
         unit_lower = unit_str.lower().strip()
 
-        for code, pattern in self.UNIT_PATTERNS.items():
-            if re.match(pattern, unit_lower):
+        for code, regex in self._unit_regexes:
+            if regex.match(unit_lower):
                 return code
 
         return unit_str.upper()[:10] if unit_str else 'EA'
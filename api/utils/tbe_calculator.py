@@ -6,6 +6,7 @@ Handles scoring and ranking of vendor quotations
 import logging
 from typing import Dict, List, Optional, Any
 from decimal import Decimal, ROUND_HALF_UP
+from operator import attrgetter
 from dataclasses import dataclass
 from enum import Enum
 
@@ -15,6 +16,23 @@ from sqlalchemy import text
 logger = logging.getLogger(__name__)
 
 
+def _to_decimal(value: Any) -> Decimal:
+    """
+    Convert a database value to Decimal.
+
+    NUMERIC columns already arrive as Decimal from the driver, so only
+    other types go through the str() round-trip.
+    """
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _to_float(value: Optional[Decimal]) -> Optional[float]:
+    """Convert a Decimal score to float for JSON responses."""
+    return float(value) if value is not None else None
+
+
 class ScoreCategory(Enum):
     """Score category types for TBE evaluation."""
     PRICE = 'price'
@@ -38,6 +56,22 @@ class QuotationScore:
     is_recommended: bool
     remarks: str = ""
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with scores as JSON numbers, like other endpoints."""
+        return {
+            'quotation_id': self.quotation_id,
+            'vendor_id': self.vendor_id,
+            'vendor_name': self.vendor_name,
+            'price_score': _to_float(self.price_score),
+            'quality_score': _to_float(self.quality_score),
+            'delivery_score': _to_float(self.delivery_score),
+            'compliance_score': _to_float(self.compliance_score),
+            'total_weighted_score': _to_float(self.total_weighted_score),
+            'rank': self.rank,
+            'is_recommended': self.is_recommended,
+            'remarks': self.remarks
+        }
+
 
 @dataclass
 class TBEResult:
@@ -49,6 +83,17 @@ class TBEResult:
     recommended_vendor_id: Optional[str]
     summary: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with scores and weights as JSON numbers."""
+        return {
+            'evaluation_id': self.evaluation_id,
+            'rfq_id': self.rfq_id,
+            'scores': [score.to_dict() for score in self.scores],
+            'weights': {k: _to_float(v) for k, v in self.weights.items()},
+            'recommended_vendor_id': self.recommended_vendor_id,
+            'summary': self.summary
+        }
+
 
 class TBECalculator:
     """
@@ -67,6 +112,9 @@ class TBECalculator:
 
     MAX_SCORE = Decimal('100')
 
+    # Score used for a category when no criteria have been evaluated
+    DEFAULT_CRITERIA_SCORE = Decimal('70')
+
     def __init__(self, weights: Optional[Dict[str, Decimal]] = None):
         """
         Initialize TBE Calculator.
@@ -94,60 +142,68 @@ class TBECalculator:
             TBEResult with all calculated scores
         """
         with get_db_session() as session:
-            # Get evaluation details
-            eval_result = session.execute(text("""
-                SELECT rfq_id, weight_price, weight_quality,
-                       weight_delivery, weight_compliance
-                FROM tbe_evaluations
-                WHERE id = :eval_id
+            # Get evaluation details and its submitted quotations together
+            result = session.execute(text("""
+                SELECT e.rfq_id, e.weight_price, e.weight_quality,
+                       e.weight_delivery, e.weight_compliance,
+                       q.id, q.vendor_id, v.company_name,
+                       q.total_amount, q.delivery_days,
+                       q.is_technically_compliant
+                FROM tbe_evaluations e
+                LEFT JOIN (
+                    quotations q JOIN vendors v ON q.vendor_id = v.id
+                ) ON q.rfq_id = e.rfq_id
+                AND q.status = 'submitted'
+                WHERE e.id = :eval_id
             """), {'eval_id': evaluation_id})
 
-            eval_row = eval_result.fetchone()
-            if not eval_row:
+            rows = result.fetchall()
+            if not rows:
                 raise ValueError(f"Evaluation not found: {evaluation_id}")
 
+            eval_row = rows[0]
             rfq_id = str(eval_row[0])
-            self.weights = {
-                'price': Decimal(str(eval_row[1])),
-                'quality': Decimal(str(eval_row[2])),
-                'delivery': Decimal(str(eval_row[3])),
-                'compliance': Decimal(str(eval_row[4]))
+            # Weights are per evaluation; keep them local so a shared
+            # calculator instance is safe to use from concurrent requests
+            weights = {
+                'price': _to_decimal(eval_row[1]),
+                'quality': _to_decimal(eval_row[2]),
+                'delivery': _to_decimal(eval_row[3]),
+                'compliance': _to_decimal(eval_row[4])
             }
 
-            # Get all quotations for this RFQ
-            quot_result = session.execute(text("""
-                SELECT q.id, q.vendor_id, v.company_name,
-                       q.total_amount, q.delivery_days,
-                       q.is_technically_compliant
-                FROM quotations q
-                JOIN vendors v ON q.vendor_id = v.id
-                WHERE q.rfq_id = :rfq_id
-                AND q.status = 'submitted'
-            """), {'rfq_id': rfq_id})
-
+            # An evaluation without quotations comes back as a single row
+            # with NULL quotation columns
             quotations = []
-            for row in quot_result:
+            for row in rows:
+                if row[5] is None:
+                    continue
                 quotations.append({
-                    'id': str(row[0]),
-                    'vendor_id': str(row[1]),
-                    'vendor_name': row[2],
-                    'total_amount': Decimal(str(row[3])) if row[3] else None,
-                    'delivery_days': row[4],
-                    'is_compliant': row[5]
+                    'id': str(row[5]),
+                    'vendor_id': str(row[6]),
+                    'vendor_name': row[7],
+                    'total_amount': _to_decimal(row[8]) if row[8] else None,
+                    'delivery_days': row[9],
+                    'is_compliant': row[10]
                 })
 
             if not quotations:
+                # Still clear scores saved by an earlier calculation so the
+                # results endpoint does not keep serving withdrawn bids
+                self._save_scores(session, evaluation_id, [])
                 return TBEResult(
                     evaluation_id=evaluation_id,
                     rfq_id=rfq_id,
                     scores=[],
-                    weights=self.weights,
+                    weights=weights,
                     recommended_vendor_id=None,
                     summary="No quotations available for evaluation"
                 )
 
             # Calculate scores
-            scores = self._calculate_all_scores(quotations, session, evaluation_id)
+            scores = self._calculate_all_scores(
+                quotations, session, evaluation_id, weights
+            )
 
             # Rank quotations
             ranked_scores = self._rank_quotations(scores)
@@ -162,7 +218,7 @@ class TBECalculator:
                 evaluation_id=evaluation_id,
                 rfq_id=rfq_id,
                 scores=ranked_scores,
-                weights=self.weights,
+                weights=weights,
                 recommended_vendor_id=recommended.vendor_id if recommended else None,
                 summary=self._generate_summary(ranked_scores)
             )
@@ -171,7 +227,8 @@ class TBECalculator:
         self,
         quotations: List[Dict],
         session,
-        evaluation_id: str
+        evaluation_id: str,
+        weights: Dict[str, Decimal]
     ) -> List[QuotationScore]:
         """Calculate scores for all quotations."""
         scores = []
@@ -185,6 +242,16 @@ class TBECalculator:
         min_delivery = min(delivery_days) if delivery_days else 0
         max_delivery = max(delivery_days) if delivery_days else 1
 
+        # Fetch criteria averages for all quotations in one query
+        criteria_scores = self._get_criteria_scores(session, evaluation_id)
+        default_score = self.DEFAULT_CRITERIA_SCORE
+
+        # Weights are constant for the evaluation, so look them up once
+        w_price = weights['price']
+        w_quality = weights['quality']
+        w_delivery = weights['delivery']
+        w_compliance = weights['compliance']
+
         for quot in quotations:
             # Calculate price score (lower is better)
             price_score = self._calculate_price_score(
@@ -197,22 +264,22 @@ class TBECalculator:
             )
 
             # Get quality scores from criteria evaluations
-            quality_score = self._get_criteria_score(
-                session, evaluation_id, quot['id'], 'quality'
+            quality_score = criteria_scores.get(
+                (quot['id'], 'quality'), default_score
             )
 
             # Get compliance score
             compliance_score = self._calculate_compliance_score(
                 quot['is_compliant'],
-                session, evaluation_id, quot['id']
+                criteria_scores.get((quot['id'], 'compliance'), default_score)
             )
 
             # Calculate weighted total
             total = (
-                price_score * self.weights['price'] +
-                quality_score * self.weights['quality'] +
-                delivery_score * self.weights['delivery'] +
-                compliance_score * self.weights['compliance']
+                price_score * w_price +
+                quality_score * w_quality +
+                delivery_score * w_delivery +
+                compliance_score * w_compliance
             )
 
             scores.append(QuotationScore(
@@ -278,48 +345,41 @@ class TBECalculator:
 
         return score.quantize(Decimal('0.01'), ROUND_HALF_UP)
 
-    def _get_criteria_score(
+    def _get_criteria_scores(
         self,
         session,
-        evaluation_id: str,
-        quotation_id: str,
-        category: str
-    ) -> Decimal:
-        """Get average score for a category from individual criteria scores."""
+        evaluation_id: str
+    ) -> Dict[tuple, Decimal]:
+        """
+        Get average criteria scores for every quotation in an evaluation.
+
+        Returns:
+            Dict mapping (quotation_id, category) to the average score
+        """
         result = session.execute(text("""
-            SELECT AVG(s.weighted_score)
+            SELECT s.quotation_id, c.category, AVG(s.weighted_score)
             FROM tbe_scores s
             JOIN tbe_criteria c ON s.criteria_id = c.id
             WHERE s.tbe_id = :eval_id
-            AND s.quotation_id = :quot_id
-            AND c.category = :category
-        """), {
-            'eval_id': evaluation_id,
-            'quot_id': quotation_id,
-            'category': category
-        })
+            AND c.category IN ('quality', 'compliance')
+            GROUP BY s.quotation_id, c.category
+        """), {'eval_id': evaluation_id})
 
-        avg_score = result.scalar()
-        if avg_score is None:
-            return Decimal('70')  # Default score if no criteria evaluated
-
-        return Decimal(str(avg_score)).quantize(Decimal('0.01'), ROUND_HALF_UP)
+        return {
+            (str(row[0]), row[1]):
+                _to_decimal(row[2]).quantize(Decimal('0.01'), ROUND_HALF_UP)
+            for row in result
+            if row[2] is not None
+        }
 
     def _calculate_compliance_score(
         self,
         is_compliant: Optional[bool],
-        session,
-        evaluation_id: str,
-        quotation_id: str
+        criteria_score: Decimal
     ) -> Decimal:
         """Calculate compliance score based on technical compliance and criteria."""
         base_score = Decimal('100') if is_compliant else Decimal('0')
 
-        # Check for compliance criteria scores
-        criteria_score = self._get_criteria_score(
-            session, evaluation_id, quotation_id, 'compliance'
-        )
-
         # Weight: 60% technical compliance, 40% criteria evaluation
         if is_compliant is None:
             return criteria_score
@@ -332,7 +392,7 @@ class TBECalculator:
         # Sort by total score descending
         sorted_scores = sorted(
             scores,
-            key=lambda s: s.total_weighted_score,
+            key=attrgetter('total_weighted_score'),
             reverse=True
         )
 
@@ -355,67 +415,95 @@ class TBECalculator:
         evaluation_id: str,
         scores: List[QuotationScore]
     ) -> None:
-        """Save calculated scores to database."""
-        for score in scores:
-            # Update or insert TBE summary
-            session.execute(text("""
-                INSERT INTO tbe_summary (
-                    tbe_id, quotation_id, vendor_id,
-                    price_score, quality_score, delivery_score, compliance_score,
-                    total_weighted_score, rank, is_recommended, remarks
-                )
-                VALUES (
-                    :tbe_id, :quot_id, :vendor_id,
-                    :price_score, :quality_score, :delivery_score, :compliance_score,
-                    :total_score, :rank, :is_recommended, :remarks
-                )
-                ON CONFLICT (tbe_id, quotation_id)
-                DO UPDATE SET
-                    price_score = :price_score,
-                    quality_score = :quality_score,
-                    delivery_score = :delivery_score,
-                    compliance_score = :compliance_score,
-                    total_weighted_score = :total_score,
-                    rank = :rank,
-                    is_recommended = :is_recommended,
-                    remarks = :remarks
-            """), {
+        """
+        Save calculated scores to database.
+
+        Summary rows for quotations that are no longer scored (e.g. no
+        longer submitted) are removed, and those quotations lose their
+        score and rank; an empty score list clears the whole evaluation.
+        """
+        session.execute(text("""
+            WITH stale AS (
+                DELETE FROM tbe_summary
+                WHERE tbe_id = :eval_id
+                AND quotation_id <> ALL(CAST(:quot_ids AS uuid[]))
+                RETURNING quotation_id
+            )
+            UPDATE quotations
+            SET overall_score = NULL, rank = NULL
+            WHERE id IN (SELECT quotation_id FROM stale)
+        """), {
+            'eval_id': evaluation_id,
+            'quot_ids': [score.quotation_id for score in scores]
+        })
+
+        if not scores:
+            return
+
+        # Build parameters once and send each statement as one executemany;
+        # the engine batches these (execute_batch on psycopg2, pipeline
+        # mode on psycopg 3) instead of a round-trip per quotation.
+        # Scores stay Decimal; the driver binds them as NUMERIC directly.
+        summary_params = [
+            {
                 'tbe_id': evaluation_id,
                 'quot_id': score.quotation_id,
                 'vendor_id': score.vendor_id,
-                'price_score': float(score.price_score),
-                'quality_score': float(score.quality_score),
-                'delivery_score': float(score.delivery_score),
-                'compliance_score': float(score.compliance_score),
-                'total_score': float(score.total_weighted_score),
+                'price_score': score.price_score,
+                'quality_score': score.quality_score,
+                'delivery_score': score.delivery_score,
+                'compliance_score': score.compliance_score,
+                'total_score': score.total_weighted_score,
                 'rank': score.rank,
                 'is_recommended': score.is_recommended,
                 'remarks': score.remarks
-            })
-
-            # Update quotation with scores
-            session.execute(text("""
-                UPDATE quotations
-                SET overall_score = :score, rank = :rank
-                WHERE id = :quot_id
-            """), {
-                'score': float(score.total_weighted_score),
-                'rank': score.rank,
-                'quot_id': score.quotation_id
-            })
+            }
+            for score in scores
+        ]
+
+        # Update or insert TBE summary
+        session.execute(text("""
+            INSERT INTO tbe_summary (
+                tbe_id, quotation_id, vendor_id,
+                price_score, quality_score, delivery_score, compliance_score,
+                total_weighted_score, rank, is_recommended, remarks
+            )
+            VALUES (
+                :tbe_id, :quot_id, :vendor_id,
+                :price_score, :quality_score, :delivery_score,
+                :compliance_score, :total_score, :rank, :is_recommended,
+                :remarks
+            )
+            ON CONFLICT (tbe_id, quotation_id)
+            DO UPDATE SET
+                price_score = EXCLUDED.price_score,
+                quality_score = EXCLUDED.quality_score,
+                delivery_score = EXCLUDED.delivery_score,
+                compliance_score = EXCLUDED.compliance_score,
+                total_weighted_score = EXCLUDED.total_weighted_score,
+                rank = EXCLUDED.rank,
+                is_recommended = EXCLUDED.is_recommended,
+                remarks = EXCLUDED.remarks
+        """), summary_params)
+
+        # Update quotations with scores
+        session.execute(text("""
+            UPDATE quotations
+            SET overall_score = :total_score, rank = :rank
+            WHERE id = :quot_id
+        """), summary_params)
 
         # Update evaluation status
-        if scores:
-            session.execute(text("""
-                UPDATE tbe_evaluations
-                SET status = 'evaluated',
-                    selected_vendor_id = :vendor_id,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = :eval_id
-            """), {
-                'vendor_id': scores[0].vendor_id,
-                'eval_id': evaluation_id
-            })
+        session.execute(text("""
+            UPDATE tbe_evaluations
+            SET status = 'evaluated',
+                selected_vendor_id = :vendor_id,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = :eval_id
+        """), {
+            'vendor_id': scores[0].vendor_id,
+            'eval_id': evaluation_id
+        })
 
     def _generate_summary(self, scores: List[QuotationScore]) -> str:
         """Generate a text summary of the evaluation results."""
@@ -475,28 +563,30 @@ class TBECalculator:
                 'score_comparison': {}
             }
 
-            prices = []
-            for row in result:
-                quot_data = {
-                    'id': str(row[0]),
-                    'vendor': row[1],
-                    'total_amount': float(row[2]) if row[2] else None,
-                    'delivery_days': row[3],
-                    'score': float(row[4]) if row[4] else None,
-                    'rank': row[5]
-                }
-                comparison['quotations'].append(quot_data)
-                if row[2]:
-                    prices.append(float(row[2]))
+            # Convert each amount once and keep the priced rows aside, so the
+            # savings pass below does not rescan or reconvert the result
+            priced = []
+            quotations = comparison['quotations']
+            for quot_id, vendor, amount, delivery_days, score, rank in result:
+                total_amount = float(amount) if amount else None
+                quotations.append({
+                    'id': str(quot_id),
+                    'vendor': vendor,
+                    'total_amount': total_amount,
+                    'delivery_days': delivery_days,
+                    'score': float(score) if score else None,
+                    'rank': rank
+                })
+                if total_amount:
+                    priced.append((vendor, total_amount))
 
-            if prices:
-                min_price = min(prices)
+            if priced:
+                min_price = min(amount for _, amount in priced)
                 comparison['price_comparison'] = {
                     'lowest': min_price,
                     'savings_potential': {
-                        q['vendor']: round((q['total_amount'] - min_price), 2)
-                        for q in comparison['quotations']
-                        if q['total_amount']
+                        vendor: round(amount - min_price, 2)
+                        for vendor, amount in priced
                     }
                 }
 
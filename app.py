@@ -5,9 +5,15 @@ Main Flask Application Entry Point
 
 import os
 from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -21,6 +27,26 @@ from api.routes import api_bp
 from database.connection import init_db, close_db
 
 
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson.
+
+    Dates are passed through to Flask's default encoder so they render
+    the same as with the stdlib provider. Dataclasses are serialized
+    natively instead of being copied through asdict().
+    Indented output (debug mode) still uses the stdlib encoder.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent') is not None:
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+
 def create_app(config_class=Config):
     """
     Application factory for creating Flask app instances.
@@ -34,6 +60,10 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Use orjson for response serialization when it is installed
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
     # Enable CORS
     CORS(app, resources={
         r"/api/*": {
@@ -49,35 +79,43 @@ def create_app(config_class=Config):
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix='/api/v1')
 
-    # Health check endpoint
+    # Health check endpoint (payload is static, so serialize it once)
+    health_payload = app.json.dumps({
+        'status': 'healthy',
+        'service': 'procure-pro-iso',
+        'version': '1.0.0'
+    })
+
     @app.route('/health')
     def health_check():
         """Health check endpoint for Railway deployment."""
-        return jsonify({
-            'status': 'healthy',
-            'service': 'procure-pro-iso',
-            'version': '1.0.0'
-        }), 200
+        return app.response_class(
+            health_payload, status=200, mimetype='application/json'
+        )
+
+    # Root endpoint (also static, so serialized once)
+    index_payload = app.json.dumps({
+        'name': 'Procure-Pro-ISO API',
+        'version': '1.0.0',
+        'description': 'Procurement Management System with ISO Compliance',
+        'documentation': '/api/v1/docs',
+        'endpoints': {
+            'projects': '/api/v1/projects',
+            'rfqs': '/api/v1/rfqs',
+            'vendors': '/api/v1/vendors',
+            'items': '/api/v1/items',
+            'bids': '/api/v1/bids',
+            'purchase_orders': '/api/v1/purchase-orders',
+            'tbe_evaluations': '/api/v1/tbe-evaluations'
+        }
+    })
 
-    # Root endpoint
     @app.route('/')
     def index():
         """Root endpoint with API information."""
-        return jsonify({
-            'name': 'Procure-Pro-ISO API',
-            'version': '1.0.0',
-            'description': 'Procurement Management System with ISO Compliance',
-            'documentation': '/api/v1/docs',
-            'endpoints': {
-                'projects': '/api/v1/projects',
-                'rfqs': '/api/v1/rfqs',
-                'vendors': '/api/v1/vendors',
-                'items': '/api/v1/items',
-                'bids': '/api/v1/bids',
-                'purchase_orders': '/api/v1/purchase-orders',
-                'tbe_evaluations': '/api/v1/tbe-evaluations'
-            }
-        }), 200
+        return app.response_class(
+            index_payload, status=200, mimetype='application/json'
+        )
 
     # Error handlers
     @app.errorhandler(404)
@@ -109,6 +147,8 @@ app = create_app()
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV', 'production') == 'development'
+    # The reloader forks a file watcher; keep it opt-in outside development
+    reload = os.environ.get('FLASK_RELOAD', str(debug)).lower() == 'true'
 
     print(f"""
     ╔══════════════════════════════════════════════════════════╗
@@ -120,4 +160,9 @@ if __name__ == '__main__':
     ╚══════════════════════════════════════════════════════════╝
     """)
 
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    app.run(
+        host='0.0.0.0',
+        port=port,
+        debug=debug,
+        use_reloader=reload
+    )
@@ -5,10 +5,13 @@ Handles PostgreSQL database connections using SQLAlchemy
 
 import os
 import logging
+import threading
 from contextlib import contextmanager
+import sqlparse
 from flask import g, current_app
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
 logger = logging.getLogger(__name__)
@@ -16,11 +19,58 @@ logger = logging.getLogger(__name__)
 # Global database engine and session factory
 _engine = None
 _session_factory = None
-
-
-def get_database_url():
+_health_engine = None
+_init_lock = threading.Lock()
+
+# Upper bound for health-check queries so a degraded database fails fast
+HEALTH_CHECK_TIMEOUT_MS = int(os.environ.get('HEALTH_CHECK_TIMEOUT_MS', 2000))
+
+# Send the health-check statement_timeout in the libpq startup packet of the
+# health engine's connections, so each probe is a single SELECT instead of
+# SET LOCAL plus SELECT. Off by default: some poolers and proxies reject
+# startup options
+HEALTH_CHECK_STARTUP_TIMEOUT = os.environ.get(
+    'HEALTH_CHECK_STARTUP_TIMEOUT', 'False'
+).lower() == 'true'
+
+# Seconds a health check may wait to connect (libpq enforces at least 2)
+# and to check out its pooled connection
+HEALTH_CHECK_CONNECT_TIMEOUT = int(
+    os.environ.get('HEALTH_CHECK_CONNECT_TIMEOUT', 2)
+)
+HEALTH_CHECK_POOL_TIMEOUT = int(os.environ.get('HEALTH_CHECK_POOL_TIMEOUT', 2))
+
+# Seconds libpq waits to establish a new connection before giving up
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+
+# Executions after which psycopg 3 switches a query to a server-side
+# prepared statement (only used with postgresql+psycopg:// URLs)
+DB_PREPARE_THRESHOLD = int(os.environ.get('DB_PREPARE_THRESHOLD', 5))
+
+# Connection pool sizing; keep (pool size + overflow) x workers below the
+# server's max_connections
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+
+# Optional session settings sent in the libpq startup packet (e.g.
+# '-c jit=off'), so they cost no extra round-trip per pooled connection.
+# Off by default: some poolers and proxies reject startup options
+DB_CONNECT_OPTIONS = os.environ.get('DB_CONNECT_OPTIONS', '')
+
+# libpq TCP settings so dead connections (e.g. dropped by a load balancer)
+# error out within seconds instead of hanging until the kernel gives up
+KEEPALIVE_ARGS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+    'tcp_user_timeout': 10000,
+}
+
+
+def _resolve_database_url():
     """
-    Get database URL from environment variables.
+    Build the database URL from environment variables.
     Handles Railway's DATABASE_URL format.
     """
     database_url = os.environ.get('DATABASE_URL')
@@ -42,48 +92,144 @@ def get_database_url():
     )
 
 
+# Resolved once at import so every caller sees the same configuration
+_database_url = _resolve_database_url()
+
+
+def get_database_url():
+    """
+    Get database URL resolved from environment variables at import time.
+    """
+    return _database_url
+
+
+def _build_engine_args(database_url, connect_timeout):
+    """
+    Build driver-specific connect and engine arguments.
+
+    Args:
+        database_url: Database URL the engine will connect to
+        connect_timeout: Seconds libpq may spend establishing a connection
+
+    Returns:
+        Tuple of (connect_args, engine_args)
+    """
+    connect_args = dict(KEEPALIVE_ARGS)
+    connect_args['connect_timeout'] = connect_timeout
+    if DB_CONNECT_OPTIONS:
+        connect_args['options'] = DB_CONNECT_OPTIONS
+
+    engine_args = {}
+    driver = make_url(database_url).get_driver_name()
+    if driver == 'psycopg':
+        connect_args['prepare_threshold'] = DB_PREPARE_THRESHOLD
+    elif driver == 'psycopg2':
+        # Page executemany() over text() statements with
+        # execute_batch(); by default psycopg2 only batches INSERTs
+        # that SQLAlchemy compiles itself. psycopg 3 pipelines
+        # executemany() on its own.
+        engine_args['executemany_mode'] = 'values_plus_batch'
+
+    return connect_args, engine_args
+
+
 def init_db(app=None):
     """
     Initialize database connection.
 
+    Safe to call repeatedly and from multiple threads; only the first
+    call creates the engine and session factory.
+
     Args:
         app: Flask application instance (optional)
     """
     global _engine, _session_factory
 
-    try:
-        database_url = get_database_url()
-
-        # Create engine with connection pooling
-        _engine = create_engine(
-            database_url,
-            pool_size=5,
-            max_overflow=10,
-            pool_timeout=30,
-            pool_recycle=1800,
-            pool_pre_ping=True,
-            echo=os.environ.get('SQLALCHEMY_ECHO', 'False').lower() == 'true'
-        )
-
-        # Create session factory
-        _session_factory = scoped_session(
-            sessionmaker(
+    if _session_factory is not None:
+        return
+
+    with _init_lock:
+        # Another thread may have initialized the engine while we waited
+        if _session_factory is not None:
+            return
+
+        try:
+            database_url = get_database_url()
+            connect_args, engine_args = _build_engine_args(
+                database_url, DB_CONNECT_TIMEOUT
+            )
+
+            # Create engine with connection pooling
+            _engine = create_engine(
+                database_url,
+                connect_args=connect_args,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=30,
+                pool_recycle=1800,
+                pool_pre_ping=True,
+                echo=(
+                    os.environ.get('SQLALCHEMY_ECHO', 'False').lower()
+                    == 'true'
+                ),
+                **engine_args
+            )
+
+            # Create session factory (sessions are scoped per request via
+            # flask.g)
+            _session_factory = sessionmaker(
                 autocommit=False,
                 autoflush=False,
                 bind=_engine
             )
-        )
 
-        logger.info("Database connection initialized successfully")
+            logger.info("Database connection initialized successfully")
 
-        # Test connection
-        with _engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-            logger.info("Database connection test successful")
+            # Test connection
+            with _engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                logger.info("Database connection test successful")
 
-    except SQLAlchemyError as e:
-        logger.error(f"Failed to initialize database: {str(e)}")
-        raise
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to initialize database: {str(e)}")
+            raise
+
+
+def _get_health_engine():
+    """
+    Get the engine used by health checks.
+
+    It keeps a single connection of its own, so a probe is bounded by the
+    short connect and checkout timeouts instead of queueing behind request
+    traffic on the main pool's 30 second checkout timeout.
+    """
+    global _health_engine
+
+    if _health_engine is None:
+        with _init_lock:
+            if _health_engine is None:
+                database_url = get_database_url()
+                connect_args, engine_args = _build_engine_args(
+                    database_url, HEALTH_CHECK_CONNECT_TIMEOUT
+                )
+                if HEALTH_CHECK_STARTUP_TIMEOUT:
+                    timeout_option = (
+                        f"-c statement_timeout={HEALTH_CHECK_TIMEOUT_MS}"
+                    )
+                    connect_args['options'] = ' '.join(filter(None, (
+                        connect_args.get('options'), timeout_option
+                    )))
+                _health_engine = create_engine(
+                    database_url,
+                    connect_args=connect_args,
+                    pool_size=1,
+                    max_overflow=0,
+                    pool_timeout=HEALTH_CHECK_POOL_TIMEOUT,
+                    pool_recycle=1800,
+                    pool_pre_ping=True,
+                    **engine_args
+                )
+    return _health_engine
 
 
 def get_db():
@@ -172,11 +318,15 @@ def execute_script(script_path):
             script = f.read()
 
         with get_db_session() as session:
-            # Split by semicolon and execute each statement
-            statements = [s.strip() for s in script.split(';') if s.strip()]
+            # Split into statements, keeping dollar-quoted function bodies
+            # intact, and skip chunks that hold only comments (psycopg2
+            # rejects an empty query)
+            statements = [
+                s for s in sqlparse.split(script)
+                if sqlparse.format(s, strip_comments=True).strip()
+            ]
             for statement in statements:
-                if statement:
-                    session.execute(text(statement))
+                session.execute(text(statement))
 
         logger.info(f"SQL script executed successfully: {script_path}")
         return True
@@ -194,9 +344,16 @@ def check_connection():
         dict with status and details
     """
     try:
-        with get_db_session() as session:
-            result = session.execute(text("SELECT version()"))
-            version = result.scalar()
+        with _get_health_engine().begin() as conn:
+            if not HEALTH_CHECK_STARTUP_TIMEOUT:
+                # Scope the timeout to this transaction only. Keep the two
+                # statements separate: with a multi-statement string
+                # psycopg 3 positions the result on the SET, which returns
+                # no rows
+                conn.execute(text(
+                    f"SET LOCAL statement_timeout = {HEALTH_CHECK_TIMEOUT_MS}"
+                ))
+            version = conn.execute(text("SELECT version()")).scalar()
 
         return {
             'status': 'healthy',
@@ -217,15 +374,20 @@ def get_table_info():
     Returns:
         List of table information dictionaries
     """
+    # Count columns with a single grouped join rather than a correlated
+    # subquery per table
     query = """
         SELECT
-            table_name,
-            (SELECT COUNT(*) FROM information_schema.columns
-             WHERE table_name = t.table_name) as column_count
+            t.table_name,
+            COUNT(c.column_name) as column_count
         FROM information_schema.tables t
-        WHERE table_schema = 'public'
-        AND table_type = 'BASE TABLE'
-        ORDER BY table_name
+        LEFT JOIN information_schema.columns c
+            ON c.table_schema = t.table_schema
+            AND c.table_name = t.table_name
+        WHERE t.table_schema = 'public'
+        AND t.table_type = 'BASE TABLE'
+        GROUP BY t.table_name
+        ORDER BY t.table_name
     """
 
     with get_db_session() as session:
@@ -0,0 +1,28 @@
+-- ============================================
+-- Migration 001: Query indexes
+-- Brings databases created from an earlier schema.sql up to date with the
+-- current index set. Safe to run more than once.
+-- ============================================
+
+-- Quotations are filtered by RFQ and status together; (rfq_id, status)
+-- also serves rfq_id-only lookups
+DROP INDEX IF EXISTS idx_quotations_rfq;
+CREATE INDEX idx_quotations_rfq ON quotations(rfq_id, status);
+
+-- TBE criteria and score lookups per evaluation
+CREATE INDEX IF NOT EXISTS idx_tbe_criteria_tbe ON tbe_criteria(tbe_id);
+CREATE INDEX IF NOT EXISTS idx_tbe_scores_tbe_quotation ON tbe_scores(tbe_id, quotation_id);
+
+-- Trigram indexes for vendor substring search; skipped when pg_trgm
+-- (PostgreSQL contrib) is not installed on the server
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+        CREATE INDEX IF NOT EXISTS idx_vendors_name_trgm ON vendors USING gin (company_name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_vendors_code_trgm ON vendors USING gin (vendor_code gin_trgm_ops);
+    ELSE
+        RAISE NOTICE 'pg_trgm is not available; skipping vendor trigram indexes';
+    END IF;
+END
+$$;
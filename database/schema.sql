@@ -8,6 +8,17 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+-- Trigram indexes for substring (ILIKE '%...%') search. pg_trgm ships with
+-- contrib; without it the vendor trigram indexes are skipped, not fatal.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+    ELSE
+        RAISE NOTICE 'pg_trgm is not available; vendor search will not use trigram indexes';
+    END IF;
+END
+$$;
 
 -- ============================================
 -- 1. USERS AND AUTHENTICATION
@@ -149,6 +160,14 @@ CREATE TABLE vendors (
 CREATE INDEX idx_vendors_code ON vendors(vendor_code);
 CREATE INDEX idx_vendors_name ON vendors(company_name);
 CREATE INDEX idx_vendors_approved ON vendors(is_approved);
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        CREATE INDEX idx_vendors_name_trgm ON vendors USING gin (company_name gin_trgm_ops);
+        CREATE INDEX idx_vendors_code_trgm ON vendors USING gin (vendor_code gin_trgm_ops);
+    END IF;
+END
+$$;
 
 -- ============================================
 -- 5. ITEM CATEGORIES AND ITEMS
@@ -301,7 +320,8 @@ CREATE TABLE quotations (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_quotations_rfq ON quotations(rfq_id);
+-- (rfq_id, status) also serves rfq_id-only lookups
+CREATE INDEX idx_quotations_rfq ON quotations(rfq_id, status);
 CREATE INDEX idx_quotations_vendor ON quotations(vendor_id);
 CREATE INDEX idx_quotations_status ON quotations(status);
 
@@ -379,6 +399,9 @@ CREATE TABLE tbe_scores (
     UNIQUE(criteria_id, quotation_id)
 );
 
+CREATE INDEX idx_tbe_criteria_tbe ON tbe_criteria(tbe_id);
+CREATE INDEX idx_tbe_scores_tbe_quotation ON tbe_scores(tbe_id, quotation_id);
+
 CREATE TABLE tbe_summary (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     tbe_id UUID REFERENCES tbe_evaluations(id) ON DELETE CASCADE,
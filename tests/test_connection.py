@@ -0,0 +1,161 @@
+"""
+Tests for database connection helpers
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+from database import connection
+
+
+class RecordingResult:
+    """Result stand-in whose scalar is the statement that produced it."""
+
+    def __init__(self, statement):
+        self.statement = statement
+
+    def scalar(self):
+        return self.statement
+
+
+class RecordingSession:
+    """Session stand-in that records the SQL it is asked to execute."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return RecordingResult(str(statement))
+
+
+@pytest.fixture
+def session(monkeypatch):
+    recording = RecordingSession()
+
+    @contextmanager
+    def fake_db_session():
+        yield recording
+
+    monkeypatch.setattr(connection, 'get_db_session', fake_db_session)
+    return recording
+
+
+def test_execute_script_skips_trailing_comment_block(tmp_path, session):
+    script = tmp_path / 'schema.sql'
+    script.write_text(
+        "CREATE TABLE a (id INT);\n"
+        "-- ============\n"
+        "-- END OF SCHEMA\n"
+        "-- ============\n"
+    )
+
+    assert connection.execute_script(str(script)) is True
+    assert len(session.statements) == 1
+    assert session.statements[0].startswith('CREATE TABLE a')
+
+
+def test_execute_script_keeps_dollar_quoted_bodies(tmp_path, session):
+    script = tmp_path / 'functions.sql'
+    script.write_text(
+        "-- Trigger function\n"
+        "CREATE FUNCTION f() RETURNS INT AS $$\n"
+        "BEGIN\n"
+        "    RETURN 1;\n"
+        "END;\n"
+        "$$ LANGUAGE plpgsql;\n"
+        "SELECT f();\n"
+    )
+
+    connection.execute_script(str(script))
+
+    assert len(session.statements) == 2
+    assert 'RETURN 1;' in session.statements[0]
+    assert session.statements[1].strip() == 'SELECT f();'
+
+
+class RecordingEngine:
+    """Engine stand-in whose transactions run on a recording session."""
+
+    def __init__(self, session):
+        self.session = session
+
+    @contextmanager
+    def begin(self):
+        yield self.session
+
+
+def test_check_connection_runs_timeout_and_probe_separately(
+    monkeypatch, session
+):
+    monkeypatch.setattr(
+        connection, '_get_health_engine', lambda: RecordingEngine(session)
+    )
+
+    result = connection.check_connection()
+
+    assert result['status'] == 'healthy'
+    assert result['version'] == 'SELECT version()'
+    assert session.statements[0].startswith('SET LOCAL statement_timeout')
+    assert ';' not in session.statements[0]
+
+
+def test_health_engine_bounds_connect_and_checkout(monkeypatch):
+    monkeypatch.setattr(
+        connection, '_database_url', 'postgresql://user:pw@db.invalid/app'
+    )
+    monkeypatch.setattr(connection, '_health_engine', None)
+
+    engine = connection._get_health_engine()
+
+    assert engine.pool.size() == 1
+    assert engine.pool.timeout() == connection.HEALTH_CHECK_POOL_TIMEOUT
+    connect_args, _ = connection._build_engine_args(
+        'postgresql://user:pw@db.invalid/app',
+        connection.HEALTH_CHECK_CONNECT_TIMEOUT
+    )
+    assert connect_args['connect_timeout'] == (
+        connection.HEALTH_CHECK_CONNECT_TIMEOUT
+    )
+
+
+def test_resolve_database_url_rewrites_railway_scheme(monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'postgres://user:pw@host:5432/app')
+
+    assert connection._resolve_database_url() == (
+        'postgresql://user:pw@host:5432/app'
+    )
+
+
+def test_check_connection_skips_set_with_startup_timeout(monkeypatch, session):
+    monkeypatch.setattr(connection, 'HEALTH_CHECK_STARTUP_TIMEOUT', True)
+    monkeypatch.setattr(
+        connection, '_get_health_engine', lambda: RecordingEngine(session)
+    )
+
+    result = connection.check_connection()
+
+    assert result['status'] == 'healthy'
+    assert session.statements == ['SELECT version()']
+
+
+def test_health_engine_sends_startup_timeout(monkeypatch):
+    monkeypatch.setattr(connection, 'HEALTH_CHECK_STARTUP_TIMEOUT', True)
+    monkeypatch.setattr(connection, 'DB_CONNECT_OPTIONS', '-c jit=off')
+    monkeypatch.setattr(
+        connection, '_database_url', 'postgresql://user:pw@db.invalid/app'
+    )
+    monkeypatch.setattr(connection, '_health_engine', None)
+    captured = {}
+
+    def fake_create_engine(url, connect_args, **kwargs):
+        captured.update(connect_args)
+
+    monkeypatch.setattr(connection, 'create_engine', fake_create_engine)
+
+    connection._get_health_engine()
+
+    assert captured['options'] == (
+        f'-c jit=off -c statement_timeout={connection.HEALTH_CHECK_TIMEOUT_MS}'
+    )
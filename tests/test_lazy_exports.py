@@ -0,0 +1,35 @@
+"""
+Tests for lazily imported package exports
+"""
+
+import importlib
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def fresh_utils(monkeypatch):
+    modules = (
+        'api.utils', 'api.utils.rfq_parser', 'api.utils.tbe_calculator'
+    )
+    for name in modules:
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module('api.utils')
+
+
+def test_exports_are_listed_before_first_access(fresh_utils):
+    assert {'RFQParser', 'TBECalculator'} <= set(dir(fresh_utils))
+    assert 'api.utils.rfq_parser' not in sys.modules
+
+
+def test_export_is_imported_on_first_access(fresh_utils):
+    parser_class = fresh_utils.RFQParser
+
+    assert parser_class.__module__ == 'api.utils.rfq_parser'
+    assert 'api.utils.tbe_calculator' not in sys.modules
+
+
+def test_unknown_name_raises_attribute_error(fresh_utils):
+    with pytest.raises(AttributeError):
+        fresh_utils.Missing
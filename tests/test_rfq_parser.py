@@ -0,0 +1,36 @@
+"""
+Tests for the RFQ parser
+"""
+
+from api.utils.rfq_parser import ParsedRFQ, RFQParser
+
+
+class DozenParser(RFQParser):
+    UNIT_PATTERNS = {'DOZ': r'\b(dozens?|dz)\b'}
+
+
+def test_normalize_unit_uses_default_patterns():
+    parser = RFQParser()
+
+    assert parser.normalize_unit('pcs') == 'EA'
+    assert parser.normalize_unit('Kgs') == 'KG'
+    assert parser.normalize_unit('xyz') == 'XYZ'
+
+
+def test_normalize_unit_honours_subclass_patterns():
+    assert DozenParser().normalize_unit('dozen') == 'DOZ'
+    assert RFQParser().normalize_unit('dozen') == 'DOZEN'
+
+
+def test_extract_rfq_details_reads_header_fields():
+    rfq = ParsedRFQ()
+    RFQParser()._extract_rfq_details(
+        "RFQ No: ABC-123\n"
+        "Issue Date: 2024-03-12\n"
+        "Payment Terms: Net 30\n",
+        rfq
+    )
+
+    assert rfq.rfq_number == 'ABC-123'
+    assert str(rfq.issue_date) == '2024-03-12'
+    assert rfq.payment_terms == 'Net 30'
@@ -0,0 +1,60 @@
+"""
+Tests for API route helpers
+"""
+
+from flask import Flask, jsonify
+
+from api.routes import cache_response, conditional_response
+
+
+def make_app():
+    app = Flask(__name__)
+    calls = []
+
+    @app.route('/counter')
+    @cache_response(ttl=60)
+    def counter():
+        calls.append(1)
+        return jsonify({'calls': len(calls)}), 200
+
+    return app, counter
+
+
+def test_cache_response_serves_cached_body_until_cleared():
+    app, counter = make_app()
+    client = app.test_client()
+
+    assert client.get('/counter').get_json() == {'calls': 1}
+    assert client.get('/counter').get_json() == {'calls': 1}
+
+    counter.cache_clear()
+
+    assert client.get('/counter').get_json() == {'calls': 2}
+
+
+def test_cache_response_revalidates_with_etag():
+    app, _ = make_app()
+    client = app.test_client()
+
+    etag = client.get('/counter').headers['ETag']
+    response = client.get('/counter', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+
+
+def test_conditional_response_reruns_handler_and_returns_304():
+    app = Flask(__name__)
+    calls = []
+
+    @app.route('/units')
+    @conditional_response
+    def units():
+        calls.append(1)
+        return jsonify({'data': ['kg']}), 200
+
+    client = app.test_client()
+    etag = client.get('/units').headers['ETag']
+    response = client.get('/units', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert len(calls) == 2
@@ -0,0 +1,58 @@
+"""
+Tests for the TBE calculator
+"""
+
+from decimal import Decimal
+
+from api.utils.tbe_calculator import QuotationScore, TBECalculator
+
+
+class RecordingSession:
+    """Session stand-in that records statements and their parameters."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append((' '.join(str(statement).split()), params))
+
+
+def make_score(quotation_id, rank):
+    return QuotationScore(
+        quotation_id=quotation_id,
+        vendor_id=f'vendor-{quotation_id}',
+        vendor_name='Vendor',
+        price_score=Decimal('80'),
+        quality_score=Decimal('70'),
+        delivery_score=Decimal('90'),
+        compliance_score=Decimal('100'),
+        total_weighted_score=Decimal('82.50'),
+        rank=rank,
+        is_recommended=rank == 1
+    )
+
+
+def test_save_scores_without_scores_clears_the_evaluation():
+    session = RecordingSession()
+
+    TBECalculator()._save_scores(session, 'eval-1', [])
+
+    assert len(session.calls) == 1
+    sql, params = session.calls[0]
+    assert sql.startswith('WITH stale AS ( DELETE FROM tbe_summary')
+    assert params == {'eval_id': 'eval-1', 'quot_ids': []}
+
+
+def test_save_scores_removes_only_stale_rows_and_upserts():
+    session = RecordingSession()
+    scores = [make_score('q1', 1), make_score('q2', 2)]
+
+    TBECalculator()._save_scores(session, 'eval-1', scores)
+
+    stale_sql, stale_params = session.calls[0]
+    assert 'quotation_id <> ALL' in stale_sql
+    assert stale_params['quot_ids'] == ['q1', 'q2']
+
+    upsert_sql, upsert_params = session.calls[1]
+    assert 'ON CONFLICT (tbe_id, quotation_id) DO UPDATE' in upsert_sql
+    assert [p['quot_id'] for p in upsert_params] == ['q1', 'q2']